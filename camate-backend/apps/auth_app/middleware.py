@@ -1,34 +1,93 @@
+import time
+import threading
+from hashlib import blake2b
+
 import jwt
 from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from services.db_router import set_current_ca_code
 
+# ─── Verified-token cache ─────────────────────────────────────────────────────
+# Process-local map of token digest → (payload, exp). Only tokens that passed
+# signature verification are stored, and each entry dies with the token's exp.
+_PAYLOAD_CACHE_MAX = 10_000
+_payload_cache = {}
+_payload_cache_lock = threading.Lock()
+
+
+def _decode_token(token):
+    """Verify a JWT, serving repeat tokens from the cache until they expire."""
+    key = blake2b(token.encode(), digest_size=16).hexdigest()
+    cached = _payload_cache.get(key)
+    if cached is not None:
+        payload, exp = cached
+        if exp > time.time():
+            return payload
+        with _payload_cache_lock:
+            _payload_cache.pop(key, None)
+
+    # Decode using the simplejwt signing key
+    payload = jwt.decode(
+        token,
+        settings.SIMPLE_JWT['SIGNING_KEY'],
+        algorithms=['HS256']
+    )
+    exp = payload.get('exp')
+    if exp is not None:
+        with _payload_cache_lock:
+            if len(_payload_cache) >= _PAYLOAD_CACHE_MAX:
+                # Evict the oldest insertion to keep the cache bounded
+                _payload_cache.pop(next(iter(_payload_cache)), None)
+            _payload_cache[key] = (payload, exp)
+    return payload
+
+
+_SENTINEL = object()
+
+
 def get_current_user_payload(request):
     """
     Utility to decode JWT from headers and return payload.
+    The result (None included) is memoized on request.jwt_payload, so the
+    middleware, permission classes and view share a single decode.
     """
+    cached = getattr(request, 'jwt_payload', _SENTINEL)
+    if cached is not _SENTINEL:
+        return cached
+
+    request.jwt_payload = payload = _payload_from_header(request)
+    return payload
+
+
+def _payload_from_header(request):
     auth_header = request.headers.get('Authorization')
     if not auth_header or not auth_header.startswith('Bearer '):
         return None
-    
+
     token = auth_header.split(' ')[1]
     try:
-        # Decode using the simplejwt signing key
-        payload = jwt.decode(
-            token, 
-            settings.SIMPLE_JWT['SIGNING_KEY'], 
-            algorithms=['HS256']
-        )
-        return payload
+        return _decode_token(token)
     except Exception:
         return None
 
+
+# Paths that are never tenant-scoped; no point parsing or verifying a token
+_SKIP_PREFIXES = ('/static/', '/media/', '/health', '/favicon.ico')
+
+
 class TenantMiddleware(MiddlewareMixin):
     """
-    Middleware that identifies the tenant (CA Firm) from the JWT 
+    Middleware that identifies the tenant (CA Firm) from the JWT
     and sets the routing context for the database router.
     """
     def process_request(self, request):
+        if request.path.startswith(_SKIP_PREFIXES):
+            # Still clear the context so a pooled thread can't carry a tenant over
+            request.jwt_payload = None
+            set_current_ca_code(None)
+            return None
+
+        # Also sets request.jwt_payload, which views behind a role permission read
         payload = get_current_user_payload(request)
         if payload and 'ca_code' in payload:
             set_current_ca_code(payload['ca_code'])
@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-14 10:00
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    CAFirm = apps.get_model('auth_app', 'CAFirm')
+    firms = CAFirm.objects.using(schema_editor.connection.alias)
+
+    # email is unique, and registration used to compare it case-sensitively,
+    # so two firms may differ only by case. Lowercasing those would collide;
+    # which account to keep is a human decision, so stop and say which.
+    duplicates = list(
+        firms.annotate(email_lower=Lower('email'))
+        .values('email_lower')
+        .annotate(n=Count('pk'))
+        .filter(n__gt=1)
+        .order_by('email_lower')
+        .values_list('email_lower', flat=True)
+    )
+    if duplicates:
+        clashes = []
+        for email in duplicates:
+            codes = firms.filter(email__iexact=email).order_by('ca_code').values_list('ca_code', flat=True)
+            clashes.append(f"  {email}: {', '.join(codes)}")
+        raise RuntimeError(
+            "Cannot lowercase CA firm emails: these addresses are registered more "
+            "than once, differing only by case (ca_codes listed). Merge or change "
+            "the extra firms' emails, then re-run migrate.\n" + "\n".join(clashes)
+        )
+
+    firms.exclude(email=Lower('email')).update(email=Lower('email'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher, check_password, make_password
+
+# Hashes written before the switch to Django's hashers are raw bcrypt output.
+# Django's BCryptPasswordHasher stores the same string behind a "bcrypt$" prefix.
+# They were hashed from the raw password bytes, so they cannot be verified with
+# a SHA-256 pre-hash; they are replaced by Argon2id on the next good login.
+_LEGACY_BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+
+class FastArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id at minimal cost, for local dev and test runs only.
+    The parameters are stored in each hash, so hashes made by either
+    hasher verify under the other.
+    """
+    time_cost = 1
+    memory_cost = 1024
+    parallelism = 1
+
+
+def hash_password(raw_password):
+    """Hash a password with the preferred hasher (Argon2id)."""
+    return make_password(raw_password)
+
+
+def verify_password(raw_password, user):
+    """
+    Check a password against user.password_hash.
+    On success, hashes from an older hasher (or older cost parameters) are
+    upgraded in place and saved back to the database the user was loaded from.
+    """
+    encoded = user.password_hash
+    if encoded.startswith(_LEGACY_BCRYPT_PREFIXES):
+        encoded = f"bcrypt${encoded}"
+
+    def setter(password):
+        user.password_hash = make_password(password)
+        user.save(using=user._state.db, update_fields=['password_hash'])
+
+    return check_password(raw_password, encoded, setter)
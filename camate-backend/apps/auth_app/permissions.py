@@ -0,0 +1,20 @@
+from rest_framework import permissions
+from .middleware import get_current_user_payload
+
+
+def HasRole(role):
+    """
+    Builds a DRF permission class that admits requests whose JWT carries
+    the given role ('ca' or 'customer').
+    """
+    class _HasRole(permissions.BasePermission):
+        def has_permission(self, request, view):
+            payload = get_current_user_payload(request)
+            return bool(payload) and payload.get('role') == role
+
+    _HasRole.__name__ = _HasRole.__qualname__ = f"Has{role.title()}Role"
+    return _HasRole
+
+
+IsCA = HasRole('ca')
+IsCustomer = HasRole('customer')
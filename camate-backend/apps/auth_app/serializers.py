@@ -1,10 +1,12 @@
-import bcrypt
 import re
 from rest_framework import serializers
 from .models import CAFirm
+from .passwords import hash_password
 from apps.users.models import Customer
-from services.db_router import get_ca_db_alias, _is_sqlite
-from django.db import DEFAULT_DB_ALIAS
+from services.db_router import get_ca_db_alias, ca_code_exists, _is_sqlite
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+
+GSTIN_RE = re.compile(r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$')
 
 class CARegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -23,8 +25,7 @@ class CARegistrationSerializer(serializers.ModelSerializer):
         value = value.upper().strip()
         if not re.match(r'^[A-Z0-9]+$', value):
             raise serializers.ValidationError("CA Code must be alphanumeric only (letters and numbers, no spaces or symbols).")
-        if CAFirm.objects.filter(ca_code=value).exists():
-            raise serializers.ValidationError("This CA Code is already taken. Please choose another.")
+        # Uniqueness is enforced by the ca_code unique constraint in create()
         return value
 
     def validate_username(self, value):
@@ -33,17 +34,27 @@ class CARegistrationSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value):
+        # Stored lowercased so login can match on the plain unique index
+        value = value.lower()
         if CAFirm.objects.filter(email=value).exists():
             raise serializers.ValidationError("Email already registered.")
         return value
 
     def create(self, validated_data):
         password = validated_data.pop('password')
-        hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        ca_firm = CAFirm.objects.create(
-            password_hash=hashed_pw,
-            **validated_data
-        )
+        hashed_pw = hash_password(password)
+        try:
+            with transaction.atomic():
+                ca_firm = CAFirm.objects.create(
+                    password_hash=hashed_pw,
+                    **validated_data
+                )
+        except IntegrityError:
+            if CAFirm.objects.filter(ca_code=validated_data['ca_code']).exists():
+                raise serializers.ValidationError(
+                    {"ca_code": ["This CA Code is already taken. Please choose another."]}
+                )
+            raise
         return ca_firm
 
 class CustomerRegistrationSerializer(serializers.ModelSerializer):
@@ -56,21 +67,21 @@ class CustomerRegistrationSerializer(serializers.ModelSerializer):
 
     def validate_ca_code(self, value):
         value = value.upper().strip()
-        if not CAFirm.objects.filter(ca_code__iexact=value).exists():
+        if not ca_code_exists(value):
             raise serializers.ValidationError(
                 f"CA Code '{value}' not found. Please check the code given by your CA."
             )
         return value
 
     def validate_gstin(self, value):
-        if value and not re.match(
-            r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$',
-            value.upper()
-        ):
+        if not value:
+            return value
+        value = value.upper()
+        if not GSTIN_RE.match(value):
             raise serializers.ValidationError(
                 "Invalid GSTIN format. Expected: 22AAAAA0000A1Z5"
             )
-        return value.upper() if value else value
+        return value
 
     def create(self, validated_data):
         password = validated_data.pop('password')
@@ -82,7 +93,7 @@ class CustomerRegistrationSerializer(serializers.ModelSerializer):
         if Customer.objects.using(db_alias).filter(username=validated_data['username']).exists():
             raise serializers.ValidationError({"username": "Username already exists for this CA firm."})
 
-        hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed_pw = hash_password(password)
 
         customer = Customer(
             password_hash=hashed_pw,
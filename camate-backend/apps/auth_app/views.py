@@ -1,28 +1,51 @@
-import bcrypt
+import time
+import uuid
+
+import jwt
+from django.conf import settings
 from rest_framework import status, views
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import CAFirm
+from .passwords import verify_password
 from .serializers import CARegistrationSerializer, CustomerRegistrationSerializer, LoginSerializer
 from apps.users.models import Customer
 from services.db_router import get_ca_db_alias, create_ca_database, _is_sqlite
 from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Case, Q, Value, When
+
+# Resolved once at import instead of through the settings proxy per login
+_SIGNING_KEY = settings.SIMPLE_JWT['SIGNING_KEY']
+_ACCESS_LIFETIME = int(settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds())
+_REFRESH_LIFETIME = int(settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+
 
 def generate_tokens(user_data):
-    refresh = RefreshToken()
-    refresh['user_id'] = str(user_data['id'])
-    refresh['role'] = user_data['role']
-    refresh['ca_code'] = user_data['ca_code']
-    refresh['username'] = user_data['username']
-    refresh['full_name'] = user_data['full_name']
+    """
+    Sign a refresh/access pair directly with PyJWT.
+    Claims mirror simplejwt's (token_type, exp, iat, jti) so TokenRefreshView
+    and LogoutView keep accepting these tokens.
+    """
+    now = int(time.time())
+    claims = {
+        'user_id': str(user_data['id']),
+        'role': user_data['role'],
+        'ca_code': user_data['ca_code'],
+        'username': user_data['username'],
+        'full_name': user_data['full_name'],
+        'iat': now,
+    }
     if user_data.get('firm_name'):
-        refresh['firm_name'] = user_data['firm_name']
+        claims['firm_name'] = user_data['firm_name']
+
+    refresh = {**claims, 'token_type': 'refresh', 'exp': now + _REFRESH_LIFETIME, 'jti': uuid.uuid4().hex}
+    access = {**claims, 'token_type': 'access', 'exp': now + _ACCESS_LIFETIME, 'jti': uuid.uuid4().hex}
 
     return {
-        'refresh': str(refresh),
-        'access': str(refresh.access_token),
+        'refresh': jwt.encode(refresh, _SIGNING_KEY, algorithm='HS256'),
+        'access': jwt.encode(access, _SIGNING_KEY, algorithm='HS256'),
     }
 
 class CARegistrationView(views.APIView):
@@ -60,6 +83,11 @@ class CustomerRegistrationView(views.APIView):
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def _username_first(identifier):
+    """Ordering that puts a username match ahead of an email match."""
+    return Case(When(username=identifier, then=Value(0)), default=Value(1))
+
+
 class LoginView(views.APIView):
     permission_classes = [AllowAny]
 
@@ -75,10 +103,11 @@ class LoginView(views.APIView):
         user_data = None
         
         if role == 'ca':
-            ca = CAFirm.objects.filter(username=identifier).first() or \
-                 CAFirm.objects.filter(email=identifier).first()
-            
-            if ca and bcrypt.checkpw(password.encode('utf-8'), ca.password_hash.encode('utf-8')):
+            ca = CAFirm.objects.filter(
+                Q(username=identifier) | Q(email=identifier.lower())
+            ).order_by(_username_first(identifier)).only('id', 'ca_code', 'username', 'full_name', 'firm_name', 'password_hash').first()
+
+            if ca and verify_password(password, ca):
                 user_data = {
                     "id": ca.id,
                     "role": "ca",
@@ -91,10 +120,11 @@ class LoginView(views.APIView):
             ca_code = serializer.validated_data['ca_code']
             db_alias = DEFAULT_DB_ALIAS if _is_sqlite() else get_ca_db_alias(ca_code)
 
-            customer = Customer.objects.using(db_alias).filter(username=identifier).first() or \
-                       Customer.objects.using(db_alias).filter(email=identifier).first()
-            
-            if customer and bcrypt.checkpw(password.encode('utf-8'), customer.password_hash.encode('utf-8')):
+            customer = Customer.objects.using(db_alias).filter(
+                Q(username=identifier) | Q(email=identifier)
+            ).order_by(_username_first(identifier)).only('id', 'ca_code', 'username', 'full_name', 'password_hash').first()
+
+            if customer and verify_password(password, customer):
                 user_data = {
                     "id": customer.id,
                     "role": "customer",
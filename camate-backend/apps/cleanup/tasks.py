@@ -1,37 +1,81 @@
 import logging
-from celery import shared_task
+from celery import chord, shared_task
 from django.utils import timezone
-from services.db_router import load_all_ca_databases, get_ca_db_alias
-from services.r2 import delete_file
+from services.db_router import register_ca_database
+from services.r2 import DELETE_BATCH_SIZE, delete_files
 from apps.uploads.models import Upload
 from apps.auth_app.models import CAFirm
-from django.db import DEFAULT_DB_ALIAS
+from django.db import DEFAULT_DB_ALIAS, transaction
 
 logger = logging.getLogger(__name__)
 
 @shared_task
 def cleanup_expired_uploads():
-    """Runs daily. Deletes uploads past their 90-day expiry from R2 and DB."""
-    load_all_ca_databases()
-    firms = CAFirm.objects.using(DEFAULT_DB_ALIAS).all()
-    total_deleted = 0
-
-    for firm in firms:
-        db_alias = get_ca_db_alias(firm.ca_code)
-        try:
-            expired = Upload.objects.using(db_alias).filter(
-                expires_at__lt=timezone.now()
-            )
-            for upload in expired:
-                r2_success = delete_file(upload.storage_key)
-                if r2_success:
-                    upload.delete(using=db_alias)
-                    total_deleted += 1
-                    logger.info(f"Deleted expired upload {upload.id} for {firm.ca_code}")
-                else:
-                    logger.warning(f"R2 delete failed for {upload.storage_key}, skipping DB delete.")
-        except Exception as e:
-            logger.error(f"Cleanup failed for {firm.ca_code}: {e}")
+    """
+    Runs daily. Fans out one cleanup_firm task per CA firm and sums the
+    deleted counts in a chord callback. Returns the number of firms dispatched.
+    """
+    ca_codes = list(CAFirm.objects.using(DEFAULT_DB_ALIAS).values_list('ca_code', flat=True))
+    if not ca_codes:
+        logger.info("Cleanup skipped: no CA firms registered.")
+        return 0
 
+    chord(cleanup_firm.s(ca_code) for ca_code in ca_codes)(sum_deleted_counts.s())
+    logger.info(f"Cleanup dispatched for {len(ca_codes)} firms.")
+    return len(ca_codes)
+
+@shared_task
+def cleanup_firm(ca_code: str):
+    """
+    Deletes one firm's uploads past their 90-day expiry from R2 and DB.
+    Expired rows come from the indexed expires_at column, never from a
+    bucket listing.
+    Works in locked batches with SKIP LOCKED, so concurrent workers on the
+    same firm split the rows between them instead of double-deleting.
+    """
+    try:
+        db_alias = register_ca_database(ca_code)
+        now = timezone.now()
+        total_deleted = 0
+        failed_ids = []
+
+        while True:
+            with transaction.atomic(using=db_alias):
+                batch = list(
+                    Upload.objects.using(db_alias)
+                    .select_for_update(skip_locked=True)
+                    .filter(expires_at__lt=now)
+                    .exclude(id__in=failed_ids)
+                    # One storage batch request per locked DB batch
+                    .values_list('id', 'storage_key')[:DELETE_BATCH_SIZE]
+                )
+                if not batch:
+                    break
+
+                removed = set(delete_files([storage_key for _, storage_key in batch]))
+                deleted_ids = []
+                for upload_id, storage_key in batch:
+                    if storage_key in removed:
+                        deleted_ids.append(upload_id)
+                    else:
+                        # Excluded from later batches so the loop always drains
+                        failed_ids.append(upload_id)
+                        logger.warning(f"R2 delete failed for {storage_key}, skipping DB delete.")
+
+                if deleted_ids:
+                    Upload.objects.using(db_alias).filter(id__in=deleted_ids).delete()
+                    total_deleted += len(deleted_ids)
+
+        if total_deleted:
+            logger.info(f"Deleted {total_deleted} expired uploads for {ca_code}")
+        return total_deleted
+    except Exception:
+        # Log with traceback but return 0 so the chord still totals other firms
+        logger.exception(f"Cleanup failed for {ca_code}")
+        return 0
+
+@shared_task
+def sum_deleted_counts(counts):
+    total_deleted = sum(counts)
     logger.info(f"Cleanup complete. Total deleted: {total_deleted}")
-    return total_deleted
\ No newline at end of file
+    return total_deleted
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-14 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outputs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gstr1output',
+            index=models.Index(fields=['customer_id', 'financial_year', 'month', '-generated_at'], name='gstr1_out_cust_fy_mo_gen_idx'),
+        ),
+    ]
@@ -25,6 +25,13 @@ class GSTR1Output(models.Model):
     class Meta:
         db_table = 'gstr1_outputs'
         app_label = 'outputs'
+        indexes = [
+            # Latest output for a customer/period (TriggerVerificationView)
+            models.Index(
+                fields=['customer_id', 'financial_year', 'month', '-generated_at'],
+                name='gstr1_out_cust_fy_mo_gen_idx',
+            ),
+        ]
 
 class VerificationRun(models.Model):
     """
@@ -1,15 +1,9 @@
-from rest_framework import views, status, permissions
+from rest_framework import views, status
 from rest_framework.response import Response
 from .models import GSTR1Output, VerificationRun, VerificationError
 from .serializers import GSTR1OutputSerializer, VerificationRunSerializer
 from services import r2, fastapi_client
-from apps.auth_app.middleware import get_current_user_payload
-
-
-class IsCA(permissions.BasePermission):
-    def has_permission(self, request, view):
-        payload = get_current_user_payload(request)
-        return payload and payload.get('role') == 'ca'
+from apps.auth_app.permissions import IsCA
 
 
 class TriggerGSTR1GenerationView(views.APIView):
@@ -21,7 +15,8 @@ class TriggerGSTR1GenerationView(views.APIView):
     permission_classes = [IsCA]
 
     def post(self, request):
-        payload = get_current_user_payload(request)
+        # Set by TenantMiddleware; IsCA has already rejected requests without it
+        payload = request.jwt_payload
         data = request.data
 
         required = ['customer_id', 'financial_year', 'month', 'upload_ids']
@@ -32,8 +27,11 @@ class TriggerGSTR1GenerationView(views.APIView):
         try:
             # Fetch storage keys for the upload IDs from the uploads app
             from apps.uploads.models import Upload
-            uploads = Upload.objects.filter(id__in=data['upload_ids'])
-            upload_keys = [u.storage_key for u in uploads if u.storage_key]
+            upload_keys = list(
+                Upload.objects.filter(id__in=data['upload_ids'])
+                .exclude(storage_key='')
+                .values_list('storage_key', flat=True)
+            )
 
             fastapi_payload = {
                 "ca_code": payload['ca_code'],
@@ -94,7 +92,8 @@ class TriggerVerificationView(views.APIView):
     permission_classes = [IsCA]
 
     def post(self, request):
-        payload = get_current_user_payload(request)
+        # Set by TenantMiddleware; IsCA has already rejected requests without it
+        payload = request.jwt_payload
         data = request.data
 
         customer_id  = data.get('customer_id')
@@ -109,7 +108,9 @@ class TriggerVerificationView(views.APIView):
             customer_id=customer_id,
             financial_year=financial_year,
             month=month
-        ).order_by('-generated_at').first()
+        ).order_by('-generated_at').only(
+            'id', 'storage_key', 'customer_name', 'customer_id', 'financial_year', 'month'
+        ).first()
 
         if not output:
             return Response(
@@ -148,10 +149,13 @@ class TriggerVerificationView(views.APIView):
                 "status": run.status,
             }
 
-            if run.corrected_key:
-                response_data['corrected_download_url'] = r2.get_download_presigned_url(run.corrected_key)
-            if run.error_report_key:
-                response_data['error_report_download_url'] = r2.get_download_presigned_url(run.error_report_key)
+            corrected_url, error_report_url = r2.get_download_presigned_urls(
+                [run.corrected_key, run.error_report_key]
+            )
+            if corrected_url:
+                response_data['corrected_download_url'] = corrected_url
+            if error_report_url:
+                response_data['error_report_download_url'] = error_report_url
 
             return Response(response_data, status=status.HTTP_200_OK)
 
@@ -170,9 +174,12 @@ class VerificationResultView(views.APIView):
 
         data = VerificationRunSerializer(run).data
 
-        if run.corrected_key:
-            data['corrected_download_url'] = r2.get_download_presigned_url(run.corrected_key)
-        if run.error_report_key:
-            data['error_report_download_url'] = r2.get_download_presigned_url(run.error_report_key)
+        corrected_url, error_report_url = r2.get_download_presigned_urls(
+            [run.corrected_key, run.error_report_key]
+        )
+        if corrected_url:
+            data['corrected_download_url'] = corrected_url
+        if error_report_url:
+            data['error_report_download_url'] = error_report_url
 
         return Response(data)
\ No newline at end of file
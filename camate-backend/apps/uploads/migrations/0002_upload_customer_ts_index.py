@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-14 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='upload',
+            index=models.Index(fields=['customer_id', '-uploaded_at'], name='upload_customer_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-14 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0002_upload_customer_ts_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='upload',
+            index=models.Index(fields=['customer_id', 'financial_year', 'month', '-uploaded_at'], name='upload_customer_fy_mo_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='upload',
+            index=models.Index(fields=['expires_at'], name='upload_expires_at_idx'),
+        ),
+    ]
@@ -33,6 +33,17 @@ class Upload(models.Model):
     class Meta:
         db_table = 'uploads'
         app_label = 'uploads'
+        indexes = [
+            # Per-customer upload lists, newest first
+            models.Index(fields=['customer_id', '-uploaded_at'], name='upload_customer_ts_idx'),
+            # Same lists filtered to a period
+            models.Index(
+                fields=['customer_id', 'financial_year', 'month', '-uploaded_at'],
+                name='upload_customer_fy_mo_ts_idx',
+            ),
+            # Daily cleanup: expires_at < now
+            models.Index(fields=['expires_at'], name='upload_expires_at_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # Auto-set expires_at to 90 days after upload if not set
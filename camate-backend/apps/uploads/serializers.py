@@ -1,6 +1,41 @@
+from django.db import models
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 from .models import Upload
 
+
+class FastListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that resolves the child's readable fields once per list
+    instead of once per row, then runs a flat loop over the instances.
+    Output is identical to DRF's Serializer.to_representation; only use it
+    for children that don't override to_representation.
+    """
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        # Built from the public `fields` mapping (not DRF's private
+        # _readable_fields), skipping write-only fields as DRF does
+        fields = [
+            (field.field_name, field.get_attribute, field.to_representation)
+            for field in self.child.fields.values()
+            if not field.write_only
+        ]
+
+        rows = []
+        for instance in iterable:
+            ret = {}
+            for field_name, get_attribute, to_representation in fields:
+                try:
+                    attribute = get_attribute(instance)
+                except SkipField:
+                    continue
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                ret[field_name] = None if check_for_none is None else to_representation(attribute)
+            rows.append(ret)
+        return rows
+
+
 class UploadPresignSerializer(serializers.Serializer):
     file_name = serializers.CharField(max_length=255)
     file_size = serializers.IntegerField()
@@ -16,6 +51,7 @@ class UploadListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Upload
         fields = '__all__'
+        list_serializer_class = FastListSerializer
 
 class MapSheetSerializer(serializers.Serializer):
     GSTR_SHEETS = [
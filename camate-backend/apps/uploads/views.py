@@ -1,4 +1,4 @@
-from rest_framework import views, status, permissions
+from rest_framework import views, status
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from .models import Upload
@@ -9,21 +9,12 @@ from .serializers import (
 from apps.users.models import Customer
 from services.r2 import get_upload_presigned_url, STORAGE_ROOT
 from apps.auth_app.middleware import get_current_user_payload
+from apps.auth_app.permissions import IsCA, IsCustomer
+from django.http import StreamingHttpResponse
+import orjson
 import os
 
 
-class IsCustomer(permissions.BasePermission):
-    def has_permission(self, request, view):
-        payload = get_current_user_payload(request)
-        return payload and payload.get('role') == 'customer'
-
-
-class IsCA(permissions.BasePermission):
-    def has_permission(self, request, view):
-        payload = get_current_user_payload(request)
-        return payload and payload.get('role') == 'ca'
-
-
 class PresignUploadView(views.APIView):
     permission_classes = [IsCustomer]
 
@@ -91,6 +82,31 @@ class ConfirmUploadView(views.APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+STREAM_CHUNK_SIZE = 500
+
+
+def _stream_uploads(queryset):
+    """
+    Yields the serialized upload list as a JSON array, one DB chunk at a
+    time, so long histories never sit in memory all at once.
+    The body runs after the view has returned, so `queryset` must already
+    be pinned to the tenant DB with .using() by the caller.
+    """
+    rows = queryset.iterator(chunk_size=STREAM_CHUNK_SIZE)
+    yield b'['
+    first = True
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == STREAM_CHUNK_SIZE:
+            yield (b'' if first else b',') + orjson.dumps(UploadListSerializer(batch, many=True).data)[1:-1]
+            first = False
+            batch = []
+    if batch:
+        yield (b'' if first else b',') + orjson.dumps(UploadListSerializer(batch, many=True).data)[1:-1]
+    yield b']'
+
+
 class MyUploadsView(views.APIView):
     permission_classes = [IsCustomer]
 
@@ -103,8 +119,11 @@ class MyUploadsView(views.APIView):
         if fy:    queryset = queryset.filter(financial_year=fy)
         if month: queryset = queryset.filter(month=month)
 
-        serializer = UploadListSerializer(queryset.order_by('-uploaded_at'), many=True)
-        return Response(serializer.data)
+        # Pin the tenant DB now, while the router still sees this request's
+        # ca_code; the generator only runs once the response is streamed
+        queryset = queryset.order_by('-uploaded_at')
+        queryset = queryset.using(queryset.db)
+        return StreamingHttpResponse(_stream_uploads(queryset), content_type='application/json')
 
 
 class CACustomerUploadsView(views.APIView):
@@ -114,16 +133,18 @@ class CACustomerUploadsView(views.APIView):
         fy = request.query_params.get('financial_year')
         month = request.query_params.get('month')
 
-        customer = Customer.objects.filter(id=customer_id).first()
-        if not customer:
+        if not Customer.objects.filter(id=customer_id).exists():
             return Response({"error": "Customer not found in your firm."}, status=status.HTTP_404_NOT_FOUND)
 
         queryset = Upload.objects.filter(customer_id=customer_id)
         if fy:    queryset = queryset.filter(financial_year=fy)
         if month: queryset = queryset.filter(month=month)
 
-        serializer = UploadListSerializer(queryset.order_by('-uploaded_at'), many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Pin the tenant DB now, while the router still sees this request's
+        # ca_code; the generator only runs once the response is streamed
+        queryset = queryset.order_by('-uploaded_at')
+        queryset = queryset.using(queryset.db)
+        return StreamingHttpResponse(_stream_uploads(queryset), content_type='application/json')
 
 
 class MapSheetView(views.APIView):
@@ -134,16 +155,14 @@ class MapSheetView(views.APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        upload = Upload.objects.filter(id=upload_id).first()
-        if not upload:
+        gstr_sheet = serializer.validated_data['gstr_sheet']
+        # Single UPDATE of the two columns; the rowcount doubles as the 404 check
+        updated = Upload.objects.filter(id=upload_id).update(gstr_sheet=gstr_sheet, status='Received')
+        if not updated:
             return Response({"error": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        upload.gstr_sheet = serializer.validated_data['gstr_sheet']
-        upload.status = 'Received'
-        upload.save()
-
         return Response({
-            "upload_id": upload.id,
-            "gstr_sheet": upload.gstr_sheet,
+            "upload_id": upload_id,
+            "gstr_sheet": gstr_sheet,
             "updated": True
         }, status=status.HTTP_200_OK)
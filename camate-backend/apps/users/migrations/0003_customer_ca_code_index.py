@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-14 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_customer_username'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='ca_code',
+            field=models.CharField(db_index=True, help_text='Reference to the CA firm code.', max_length=20),
+        ),
+    ]
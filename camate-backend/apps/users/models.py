@@ -14,7 +14,7 @@ class Customer(models.Model):
     gstin = models.CharField(max_length=20, blank=True)
     address = models.TextField(blank=True)
     phone = models.CharField(max_length=15, blank=True)
-    ca_code = models.CharField(max_length=20, help_text="Reference to the CA firm code.")
+    ca_code = models.CharField(max_length=20, db_index=True, help_text="Reference to the CA firm code.")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -2,18 +2,16 @@
 Users app views — CA-facing endpoints.
 GET /api/users/customers/  → list all customers registered under the CA's ca_code
 """
-from rest_framework import views, status, permissions
+from django.core.cache import cache
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from rest_framework import views, status
 from rest_framework.response import Response
 from apps.auth_app.middleware import get_current_user_payload
+from apps.auth_app.permissions import IsCA
 from .models import Customer
 
 
-class IsCA(permissions.BasePermission):
-    def has_permission(self, request, view):
-        payload = get_current_user_payload(request)
-        return payload and payload.get('role') == 'ca'
-
-
 class CustomerListView(views.APIView):
     """
     Returns all customers registered under the authenticated CA's tenant database.
@@ -21,17 +19,31 @@ class CustomerListView(views.APIView):
     so a simple Customer.objects.all() returns only this CA's customers.
     """
     permission_classes = [IsCA]
+    CACHE_SECONDS = 30
 
+    # Cached server-side per tenant only; never_cache keeps browsers and
+    # shared proxies from storing one CA's customer list
+    @method_decorator(never_cache)
     def get(self, request):
-        customers = Customer.objects.all().order_by('full_name')
-        data = [
+        cache_key = f"customer_list:{get_current_user_payload(request)['ca_code']}"
+        data = cache.get(cache_key)
+        if data is None:
+            data = self._customer_list()
+            cache.set(cache_key, data, self.CACHE_SECONDS)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _customer_list():
+        rows = Customer.objects.order_by('full_name').values_list(
+            'id', 'full_name', 'username', 'email', 'gstin'
+        )
+        return [
             {
-                "id": str(c.id),
-                "full_name": c.full_name,
-                "username": c.username,
-                "email": c.email,
-                "gstin": c.gstin or '',
+                "id": str(id_),
+                "full_name": full_name,
+                "username": username,
+                "email": email,
+                "gstin": gstin or '',
             }
-            for c in customers
-        ]
-        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
+            for id_, full_name, username, email, gstin in rows
+        ]
\ No newline at end of file
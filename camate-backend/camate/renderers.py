@@ -0,0 +1,23 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer backed by orjson.
+    UUIDs and datetimes are encoded natively (UTC as 'Z', like DRF); anything
+    orjson doesn't know falls back to DRF's own encoder.
+    """
+    _default = staticmethod(JSONEncoder().default)
+    _options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self._options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            # Browsable API / ?indent requests; orjson only supports 2 spaces
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self._default, option=options)
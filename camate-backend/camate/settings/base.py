@@ -79,6 +79,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Per-view permissions handle access control
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'camate.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 # ── JWT ───────────────────────────────────────────────────────────────────────
@@ -91,6 +95,17 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# ── Passwords ─────────────────────────────────────────────────────────────────
+# New hashes use Argon2id; existing bcrypt hashes still verify and are
+# upgraded to the first hasher on the next successful login.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    # bcrypt(hex(sha256(pw))): no 72-byte truncation, no NUL-byte issues
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    # Raw bcrypt, only for verifying pre-Argon2 rows until they are upgraded
+    'django.contrib.auth.hashers.BCryptPasswordHasher',
+]
+
 # ── CORS ──────────────────────────────────────────────────────────────────────
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -116,6 +131,15 @@ CELERY_BEAT_SCHEDULE = {
     },
 }
 
+# ── Cache ─────────────────────────────────────────────────────────────────────
+# Short-lived per-token page caches on the list endpoints. Process-local by
+# default; production.py points this at Redis so all workers share it.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 # ── Internationalisation ──────────────────────────────────────────────────────
 LANGUAGE_CODE = 'en-in'
 TIME_ZONE = 'Asia/Kolkata'
@@ -2,3 +2,6 @@ from .base import *
 
 DEBUG = True
 ALLOWED_HOSTS = ['*']
+
+# Cheap password hashing for local dev and test runs
+PASSWORD_HASHERS = ['apps.auth_app.passwords.FastArgon2PasswordHasher', *PASSWORD_HASHERS[1:]]
@@ -1,6 +1,7 @@
 import logging
-import re
+import string
 import threading
+from functools import lru_cache
 from django.db import connections, DEFAULT_DB_ALIAS
 from django.conf import settings
 from django.core.management import call_command
@@ -20,21 +21,32 @@ def get_current_ca_code():
     return getattr(_thread_local, 'ca_code', None)
 
 
+# Characters allowed in a CA code that ends up in a DB name/alias
+_ALLOWED = frozenset(string.ascii_letters + string.digits + '_')
+
 def sanitize_code(code: str) -> str:
-    if not re.match(r'^[a-zA-Z0-9_]+$', code):
+    if not code or not _ALLOWED.issuperset(code):
         raise ValueError(f"Invalid identifier format: {code}")
     return code
 
+# CA codes are bounded by tenant count, so these caches stay small and warm.
+# Invalid codes raise and are never cached.
+@lru_cache(maxsize=1024)
 def get_ca_db_name(ca_code: str) -> str:
     """Returns the physical database name: e.g., 'ca_abc123_db'."""
     return f"ca_{sanitize_code(ca_code).lower()}_db"
 
+@lru_cache(maxsize=1024)
 def get_ca_db_alias(ca_code: str) -> str:
     """Returns the Django database alias: e.g., 'ca_abc123'."""
     return f"ca_{sanitize_code(ca_code).lower()}"
 
+@lru_cache(maxsize=None)
 def _is_sqlite() -> bool:
-    """Check if the master database is SQLite (local dev mode)."""
+    """
+    Check if the master database is SQLite (local dev mode).
+    The engine is fixed for the life of the process, so the answer is cached.
+    """
     default_db = settings.DATABASES.get(DEFAULT_DB_ALIAS, {})
     engine = default_db.get('ENGINE', '')
     return 'sqlite3' in engine
@@ -107,6 +119,28 @@ def create_ca_database(ca_code: str) -> bool:
         logger.error(f"Failed to provision database for {ca_code}: {e}")
         return False
 
+def ca_code_exists(ca_code: str) -> bool:
+    """
+    Checks whether a CA firm is registered, answering from the in-memory
+    tenant registry when it is warm and falling back to the master DB
+    (registering the tenant on a hit) when it is cold.
+    """
+    if not _is_sqlite():
+        try:
+            if get_ca_db_alias(ca_code) in settings.DATABASES:
+                return True
+        except ValueError:
+            return False
+
+    from apps.auth_app.models import CAFirm
+    firm = CAFirm.objects.using(DEFAULT_DB_ALIAS).filter(
+        ca_code__iexact=ca_code
+    ).only('ca_code').first()
+    if firm is None:
+        return False
+    register_ca_database(firm.ca_code)
+    return True
+
 def load_all_ca_databases():
     """
     Queries the master registry for all CA firms and registers their DBs.
@@ -146,14 +180,13 @@ class CADatabaseRouter:
     })
 
     def db_for_read(self, model, **hints):
-        app = model._meta.app_label
-        if app in self.master_apps:
-            return DEFAULT_DB_ALIAS
-
         # In SQLite dev mode, everything goes to default
         if _is_sqlite():
             return DEFAULT_DB_ALIAS
 
+        if model._meta.app_label in self.master_apps:
+            return DEFAULT_DB_ALIAS
+
         # In PostgreSQL mode, route to tenant DB based on thread-local ca_code
         ca_code = get_current_ca_code()
         if ca_code:
@@ -1,6 +1,8 @@
 import requests
 import logging
 from decouple import config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -8,11 +10,33 @@ logger = logging.getLogger(__name__)
 BASE_URL = config('FASTAPI_SERVICE_URL', default='http://localhost:8001')
 TIMEOUT = config('FASTAPI_TIMEOUT', default=120, cast=int)
 
+# Shared keep-alive session; connection failures and 502/503 are retried with
+# backoff. Read timeouts and 504 are not: the POST may already be running on
+# FastAPI, and retrying it would run the job twice or block this worker for
+# minutes.
+# raise_on_status=False hands the last 5xx back to _post_request's error path.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        connect=3,
+        read=0,
+        backoff_factor=2,
+        status_forcelist=[502, 503],
+        allowed_methods=['POST'],
+        raise_on_status=False,
+    ),
+)
+_SESSION.mount('http://', _adapter)
+_SESSION.mount('https://', _adapter)
+
 def _post_request(endpoint: str, payload: dict) -> dict:
     url = f"{BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
     try:
         logger.info(f"Calling FastAPI: POST {url}")
-        response = requests.post(url, json=payload, timeout=TIMEOUT)
+        response = _SESSION.post(url, json=payload, timeout=TIMEOUT)
 
         if response.status_code not in (200, 201):
             error_data = response.text
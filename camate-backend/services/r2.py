@@ -19,10 +19,15 @@ STORAGE_ROOT.mkdir(parents=True, exist_ok=True)
 BASE_SERVE_URL = config('LOCAL_STORAGE_URL', default='http://127.0.0.1:8000/media')
 
 
-def _abs(storage_key: str) -> Path:
-    """Convert a storage_key to an absolute local path."""
+def _abs(storage_key: str, create_parents: bool = False) -> Path:
+    """
+    Convert a storage_key to an absolute local path.
+    Only writers need create_parents; reads and deletes must not leave
+    empty directories behind for keys that don't exist.
+    """
     p = STORAGE_ROOT / storage_key
-    p.parent.mkdir(parents=True, exist_ok=True)
+    if create_parents:
+        p.parent.mkdir(parents=True, exist_ok=True)
     return p
 
 
@@ -47,43 +52,65 @@ def get_download_presigned_url(storage_key: str) -> str:
     return f"{BASE_SERVE_URL}/{storage_key}"
 
 
-def get_file_content(storage_key: str) -> str:
-    """Reads file content from local disk."""
-    path = _abs(storage_key)
-    if not path.exists():
+def get_download_presigned_urls(storage_keys) -> list:
+    """
+    Returns serve URLs for several keys in one call, None for empty keys.
+    Signing is a string format locally, so there is nothing to parallelise.
+    """
+    return [get_download_presigned_url(k) if k else None for k in storage_keys]
+
+
+def get_file_bytes(storage_key: str) -> bytes:
+    """Reads raw file bytes from local disk in a single buffered read."""
+    try:
+        return _abs(storage_key).read_bytes()
+    except FileNotFoundError:
         raise ValueError(f"File not found in local storage: {storage_key}")
-    return path.read_text(encoding='utf-8')
+
+
+def get_file_content(storage_key: str) -> str:
+    """Reads file content from local disk (one decode, like R2's Body.read())."""
+    return get_file_bytes(storage_key).decode('utf-8')
 
 
 def save_output_file(ca_code, customer_id, financial_year, month, file_name, file_bytes: bytes) -> str:
     """Saves generated output (Excel) to local disk. Returns storage_key."""
     storage_key = f"outputs/{ca_code}/{customer_id}/{financial_year}/{month}/{file_name}"
-    path = _abs(storage_key)
+    path = _abs(storage_key, create_parents=True)
     path.write_bytes(file_bytes)
     logger.info(f"Saved output file locally: {path}")
     return storage_key
 
 
+# R2/S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+
 def delete_file(storage_key: str) -> bool:
     """Deletes a file from local storage."""
-    path = _abs(storage_key)
-    try:
-        if path.exists():
-            path.unlink()
-        return True
-    except Exception as e:
-        logger.error(f"Failed to delete local file {storage_key}: {e}")
-        return False
-
-
-def list_expired_uploads():
-    """Lists storage_keys of upload files older than 90 days."""
-    import time as _time
-    threshold = _time.time() - (90 * 24 * 3600)
-    expired = []
-    uploads_dir = STORAGE_ROOT / 'uploads'
-    if uploads_dir.exists():
-        for f in uploads_dir.rglob('*'):
-            if f.is_file() and f.stat().st_mtime < threshold:
-                expired.append(str(f.relative_to(STORAGE_ROOT)).replace('\\', '/'))
-    return expired
+    return bool(delete_files([storage_key]))
+
+
+def _delete_batch(batch) -> list:
+    # Local stand-in for a single DeleteObjects(Quiet=True) request
+    deleted = []
+    for storage_key in batch:
+        try:
+            _abs(storage_key).unlink(missing_ok=True)
+            deleted.append(storage_key)
+        except Exception as e:
+            logger.error(f"Failed to delete local file {storage_key}: {e}")
+    return deleted
+
+
+def delete_files(storage_keys) -> list:
+    """
+    Deletes any number of files, DELETE_BATCH_SIZE keys per batch request
+    (R2: one DeleteObjects call each). Returns the storage_keys that were
+    removed successfully.
+    """
+    storage_keys = list(storage_keys)
+    deleted = []
+    for start in range(0, len(storage_keys), DELETE_BATCH_SIZE):
+        deleted.extend(_delete_batch(storage_keys[start:start + DELETE_BATCH_SIZE]))
+    return deleted
@@ -14,6 +14,12 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: str = ""
     R2_BUCKET_NAME: str = "camate-files"
     R2_ENDPOINT_URL: str = ""
+    # In-process cache of downloaded objects, per worker (0 disables)
+    R2_READ_CACHE_MAX_BYTES: int = 128 * 1024 * 1024
+
+    # Processes used to parse large multi-file GSTR1 requests, per uvicorn
+    # worker; keep (workers x this) within the host's CPU count. 1 disables.
+    GSTR1_PARSE_WORKERS: int = 2
 
     # Django backend (for internal service-to-service calls if needed)
     DJANGO_INTERNAL_URL: str = "http://localhost:8000"
@@ -0,0 +1,187 @@
+"""
+Minimal streaming XLSX writer
+==============================
+Writes the handful of OOXML parts a GSTR1 workbook needs straight into a
+zip stream: one header style, one body style, inline strings, column
+widths. Rows are consumed from iterables and flushed in blocks, so memory
+stays flat no matter how many rows a sheet has.
+
+Usage:
+    write([{"name": ..., "columns": [...], "widths": [...], "rows": iterable}], output)
+"""
+import re
+import zipfile
+from typing import Any, BinaryIO, Dict, List
+from xml.sax.saxutils import escape
+
+# Rows are buffered and written to the zip stream in blocks of this size
+_FLUSH_ROWS = 1000
+
+# Control characters that are not allowed anywhere in an XML 1.0 document
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# escape() only covers &, < and >; attribute values also need quotes escaped
+_ATTR_ENTITIES = {'"': '&quot;'}
+
+# cellXfs indices in styles.xml
+HEADER_STYLE = 1
+BODY_STYLE = 2
+
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_STYLES_XML = (
+    _XML_DECL +
+    f'<styleSheet xmlns="{_NS_MAIN}">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b val="1"/><sz val="10"/><color rgb="00FFFFFF"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="001F4E79"/><bgColor rgb="001F4E79"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1" applyAlignment="1">'
+    '<alignment vertical="center"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def column_letter(index: int) -> str:
+    """1-based column index → Excel letters (1 → A, 27 → AA)."""
+    letters = ''
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell(ref: str, value, style: int) -> str:
+    if value is None or value == '':
+        # Empty but styled, so borders still show
+        return f'<c r="{ref}" s="{style}"/>'
+    text = _ILLEGAL_XML_CHARS.sub('', str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _write_sheet(stream: BinaryIO, sheet: Dict[str, Any]) -> None:
+    columns = sheet["columns"]
+    widths = sheet.get("widths") or ()
+    letters = [column_letter(i) for i in range(1, len(columns) + 1)]
+
+    head = [_XML_DECL, f'<worksheet xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">']
+    if widths:
+        head.append('<cols>')
+        head.extend(
+            f'<col min="{i}" max="{i}" width="{w}" customWidth="1"/>'
+            for i, w in enumerate(widths, start=1)
+        )
+        head.append('</cols>')
+    head.append('<sheetData>')
+    head.append(f'<row r="1" ht="{sheet.get("header_height", 30)}" customHeight="1">')
+    head.extend(_cell(f'{col}1', name, HEADER_STYLE) for col, name in zip(letters, columns))
+    head.append('</row>')
+    stream.write(''.join(head).encode('utf-8'))
+
+    # Per-column markup around the row number, built once per sheet:
+    # '<c r="B' + row + '" s="2"/>' for empty cells, and the inline-string
+    # opening for text. Only the row number and value change per cell.
+    cell_open = [f'<c r="{col}' for col in letters]
+    empty_close = f'" s="{BODY_STYLE}"/>'
+    text_close = f'" s="{BODY_STYLE}" t="inlineStr"><is><t>'
+    spaced_close = f'" s="{BODY_STYLE}" t="inlineStr"><is><t xml:space="preserve">'
+    illegal = _ILLEGAL_XML_CHARS.search
+
+    buf = []
+    append = buf.append
+    r = 1
+    for values in sheet["rows"]:
+        r += 1
+        row_num = str(r)
+        append(f'<row r="{row_num}">')
+        for opening, value in zip(cell_open, values):
+            if value is None or value == '':
+                # Empty but styled, so borders still show
+                append(opening + row_num + empty_close)
+                continue
+            text = value if type(value) is str else str(value)
+            if illegal(text):
+                text = _ILLEGAL_XML_CHARS.sub('', text)
+            close = spaced_close if text[:1].isspace() or text[-1:].isspace() else text_close
+            append(opening + row_num + close + escape(text) + '</t></is></c>')
+        append('</row>')
+        if r % _FLUSH_ROWS == 0:
+            stream.write(''.join(buf).encode('utf-8'))
+            buf.clear()
+    append('</sheetData></worksheet>')
+    stream.write(''.join(buf).encode('utf-8'))
+
+
+def write(sheets: List[Dict[str, Any]], output: BinaryIO) -> None:
+    """
+    Write `sheets` as an .xlsx package into the binary file object `output`.
+    Each sheet is {"name", "columns", "widths", "rows"[, "header_height"]};
+    "rows" may be any iterable of value lists and is consumed once.
+    """
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zf:
+        overrides = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(sheets) + 1)
+        )
+        zf.writestr('[Content_Types].xml', (
+            _XML_DECL +
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{overrides}</Types>'
+        ))
+        zf.writestr('_rels/.rels', (
+            _XML_DECL +
+            f'<Relationships xmlns="{_NS_PKG_REL}">'
+            f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ))
+        zf.writestr('xl/workbook.xml', (
+            _XML_DECL +
+            f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheets>' +
+            ''.join(
+                f'<sheet name="{escape(s["name"], _ATTR_ENTITIES)}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, s in enumerate(sheets, start=1)
+            ) +
+            '</sheets></workbook>'
+        ))
+        zf.writestr('xl/_rels/workbook.xml.rels', (
+            _XML_DECL +
+            f'<Relationships xmlns="{_NS_PKG_REL}">' +
+            ''.join(
+                f'<Relationship Id="rId{i}" Type="{_NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, len(sheets) + 1)
+            ) +
+            f'<Relationship Id="rId{len(sheets) + 1}" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ))
+        zf.writestr('xl/styles.xml', _STYLES_XML)
+
+        for i, sheet in enumerate(sheets, start=1):
+            with zf.open(f'xl/worksheets/sheet{i}.xml', 'w', force_zip64=True) as stream:
+                _write_sheet(stream, sheet)
@@ -8,9 +8,19 @@ with access to the full Excel template from R2.
 Returns: (excel_bytes: bytes, sheets_processed: int)
 """
 import io
+import os
+import re
 import csv
 import logging
-from typing import List, Dict, Any
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+import fast_xlsx
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +126,15 @@ COLUMN_MAPPINGS: Dict[str, Dict[str, str]] = {
     },
 }
 
+# Per-sheet output columns and their auto-fit widths, computed once at import
+TARGET_COLUMNS: Dict[str, List[str]] = {
+    sheet: list(mapping.values()) for sheet, mapping in COLUMN_MAPPINGS.items()
+}
+COLUMN_WIDTHS: Dict[str, List[int]] = {
+    sheet: [min(max(len(col_name), 12) + 2, 30) for col_name in columns]
+    for sheet, columns in TARGET_COLUMNS.items()
+}
+
 # Map CSV file name patterns to GSTR1 sheet names
 SHEET_DETECTION: Dict[str, str] = {
     "b2b": "b2b",
@@ -131,135 +150,218 @@ SHEET_DETECTION: Dict[str, str] = {
 }
 
 
+# One lookahead per keyword, tried in SHEET_DETECTION order from the start of
+# the name, so the first keyword in the dict wins (not the leftmost in the name)
+SHEET_DETECT_RE = re.compile(
+    '|'.join(f'(?=.*?(?P<k{i}>{re.escape(keyword)}))' for i, keyword in enumerate(SHEET_DETECTION)),
+    re.IGNORECASE | re.DOTALL | re.ASCII,
+)
+SHEET_DETECT_VALUES = list(SHEET_DETECTION.values())
+
+
 def detect_sheet(file_name: str) -> str | None:
     """Detect which GSTR1 sheet a CSV file belongs to based on its name."""
-    name_lower = file_name.lower()
-    for keyword, sheet in SHEET_DETECTION.items():
-        if keyword in name_lower:
-            return sheet
-    return None
-
-
-def parse_csv(content: str) -> tuple[List[str], List[Dict[str, str]]]:
-    """Parse CSV content into headers and rows."""
-    reader = csv.DictReader(io.StringIO(content))
-    headers = reader.fieldnames or []
-    rows = list(reader)
-    return list(headers), rows
-
-
-def map_row(row: Dict[str, str], sheet_name: str) -> Dict[str, str]:
-    """Map a CSV row's keys to standard GSTR1 column names."""
-    mapping = COLUMN_MAPPINGS.get(sheet_name, {})
-    mapped = {}
-    for src_col, target_col in mapping.items():
-        # Try exact match first, then case-insensitive
-        if src_col in row:
-            mapped[target_col] = row[src_col]
-        else:
-            for k, v in row.items():
-                if k.strip().lower() == src_col.lower():
-                    mapped[target_col] = v
-                    break
-    return mapped
+    m = SHEET_DETECT_RE.match(file_name)
+    return SHEET_DETECT_VALUES[int(m.lastgroup[1:])] if m else None
 
 
-def generate_gstr1_excel(csv_files: List[Dict[str, str]]) -> tuple[bytes, int]:
+def parse_csv(content: bytes | str) -> tuple[List[str], Iterator[List[str]]]:
     """
-    Generate a GSTR1 Excel workbook from a list of CSV files.
-    
-    Args:
-        csv_files: List of {"name": filename, "content": csv_string}
-    
-    Returns:
-        (excel_bytes, sheets_processed_count)
+    Parse CSV content into headers and a lazy iterator over the data rows
+    (blank lines are skipped). Rows are parsed as the caller consumes them.
+    Raw bytes are decoded as UTF-8 incrementally, so the file is never held
+    as a second, decoded copy.
     """
-    try:
-        import openpyxl
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
-    except ImportError:
-        raise RuntimeError("openpyxl is required. Install with: pip install openpyxl")
-
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove default sheet
-
-    # Style definitions
-    header_font = Font(bold=True, color="FFFFFF", size=10)
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
+    if isinstance(content, str):
+        stream = io.StringIO(content)
+    else:
+        stream = io.TextIOWrapper(io.BytesIO(content), encoding='utf-8', newline='')
+    reader = csv.reader(stream)
+    headers = next(reader, [])
+    rows = (row for row in reader if row)
+    return headers, rows
 
-    sheets_processed = 0
 
-    for csv_file in csv_files:
-        file_name = csv_file["name"]
-        content = csv_file["content"]
+def build_mapping_plan(headers: List[str], sheet_name: str) -> List[int]:
+    """
+    For each target column of the sheet, the index of its source column in
+    `headers`, or -1 if the CSV doesn't have it. Matches the exact header
+    first, then case-insensitively on the stripped header.
+    """
+    # Same resolution as a DictReader row: first-seen key order, last value wins
+    positions: Dict[str, int] = {}
+    for i, header in enumerate(headers):
+        positions[header] = i
 
-        sheet_name = detect_sheet(file_name)
-        if not sheet_name:
-            logger.warning(f"Could not detect sheet for file: {file_name}, skipping.")
-            continue
+    plan = []
+    for src_col in COLUMN_MAPPINGS.get(sheet_name, {}):
+        index = positions.get(src_col)
+        if index is None:
+            wanted = src_col.lower()
+            index = next((i for k, i in positions.items() if k.strip().lower() == wanted), -1)
+        plan.append(index)
+    return plan
 
-        try:
-            headers, rows = parse_csv(content)
-        except Exception as e:
-            logger.error(f"Failed to parse {file_name}: {e}")
-            continue
 
-        if not rows:
-            logger.info(f"No data rows in {file_name}, skipping.")
-            continue
+def _mapped_rows(rows: Iterable[List[str]], plan: List[int], width: int) -> Iterator[List[str]]:
+    """Yield each CSV row as a list of values in target-column order."""
+    for row in rows:
+        if len(row) < width:
+            # Short rows read as empty for the missing trailing fields
+            row = row + [''] * (width - len(row))
+        yield [row[i] if i >= 0 else '' for i in plan]
+
+
+def parse_and_map(csv_file: Dict[str, Any], materialize: bool = False) -> Optional[tuple[str, Iterable[List[str]]]]:
+    """
+    Detect, parse and column-map one CSV file.
+    Returns (sheet_name, rows) with rows in target-column order, or None if
+    the file should be skipped. With `materialize` the rows come back as a
+    list, so the result can be pickled back from a worker process.
+    """
+    file_name = csv_file["name"]
+    content = csv_file["content"]
+
+    sheet_name = detect_sheet(file_name)
+    if not sheet_name:
+        logger.warning(f"Could not detect sheet for file: {file_name}, skipping.")
+        return None
 
-        # Create or get sheet
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            start_row = ws.max_row + 1
+    try:
+        headers, rows = parse_csv(content)
+        plan = build_mapping_plan(headers, sheet_name)
+        if materialize:
+            mapped = list(_mapped_rows(rows, plan, len(headers)))
+            row_count = len(mapped)
         else:
-            ws = wb.create_sheet(title=sheet_name)
-            start_row = 1
-
-        # Get target columns for this sheet
-        target_columns = list(COLUMN_MAPPINGS.get(sheet_name, {}).values())
-
-        # Write header row (only for new sheets)
-        if start_row == 1:
-            for col_idx, col_name in enumerate(target_columns, start=1):
-                cell = ws.cell(row=1, column=col_idx, value=col_name)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_alignment
-                cell.border = thin_border
-            ws.row_dimensions[1].height = 30
-            start_row = 2
-
-        # Write data rows
-        for row_data in rows:
-            mapped = map_row(row_data, sheet_name)
-            for col_idx, col_name in enumerate(target_columns, start=1):
-                value = mapped.get(col_name, '')
-                cell = ws.cell(row=start_row, column=col_idx, value=value)
-                cell.border = thin_border
-                cell.alignment = Alignment(vertical="center")
-            start_row += 1
-
-        # Auto-fit column widths
-        for col_idx, col_name in enumerate(target_columns, start=1):
-            col_letter = get_column_letter(col_idx)
-            max_len = max(len(str(col_name)), 12)
-            ws.column_dimensions[col_letter].width = min(max_len + 2, 30)
+            # Read the whole file once here, so a decode or csv error skips
+            # this file (as in the pool path) instead of failing mid-write;
+            # the writer then re-parses it lazily
+            mapped = None
+            row_count = sum(1 for _ in rows)
+    except Exception as e:
+        logger.error(f"Failed to parse {file_name}: {e}")
+        return None
+
+    if row_count == 0:
+        logger.info(f"No data rows in {file_name}, skipping.")
+        return None
+
+    if mapped is None:
+        mapped = _mapped_rows(parse_csv(content)[1], plan, len(headers))
+
+    logger.info(f"Processed sheet '{sheet_name}' from '{file_name}' ({row_count} rows)")
+    return sheet_name, mapped
+
+
+def _parse_and_map_materialized(csv_file: Dict[str, Any]) -> Optional[tuple[str, List[List[str]]]]:
+    return parse_and_map(csv_file, materialize=True)
 
+
+def assemble_workbook(parsed: Iterable[Optional[tuple[str, Iterable[List[str]]]]]) -> tuple[bytes, int]:
+    """Write parse_and_map results, in file order, into one workbook."""
+    # sheet_name -> sheet spec; files for the same sheet append in order
+    sheets: Dict[str, Dict[str, Any]] = {}
+    sheets_processed = 0
+
+    for result in parsed:
+        if result is None:
+            continue
+        sheet_name, rows = result
+
+        sheet = sheets.get(sheet_name)
+        if sheet is None:
+            sheet = sheets[sheet_name] = {
+                "name": sheet_name,
+                "columns": TARGET_COLUMNS.get(sheet_name, []),
+                "widths": COLUMN_WIDTHS.get(sheet_name, []),
+                "sources": [],
+            }
+        sheet["sources"].append(rows)
         sheets_processed += 1
-        logger.info(f"Processed sheet '{sheet_name}' from '{file_name}' ({len(rows)} rows)")
 
     if sheets_processed == 0:
         raise ValueError("No valid GSTR1 sheets could be generated from the provided files.")
 
     # Save to bytes
     output = io.BytesIO()
-    wb.save(output)
+    fast_xlsx.write(
+        [{**sheet, "rows": chain.from_iterable(sheet["sources"])} for sheet in sheets.values()],
+        output,
+    )
     return output.getvalue(), sheets_processed
+
+
+# ─── Parallel parsing ─────────────────────────────────────────────────────────
+# Below this much CSV text, pickling the mapped rows back costs more than
+# parsing them in-process
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _parse_workers() -> int:
+    return max(1, min(settings.GSTR1_PARSE_WORKERS, os.cpu_count() or 1))
+
+
+def _mp_context():
+    """
+    forkserver, not fork: this process runs asyncio and boto3 threads, and
+    forking it could copy a lock held by one of them into the child.
+    Platforms without forkserver (Windows) fall back to spawn.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool shared by all requests in this worker."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=_parse_workers(), mp_context=_mp_context())
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next request starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_in_pool(csv_files: List[Dict[str, Any]]) -> Optional[List[Optional[tuple[str, List[List[str]]]]]]:
+    """parse_and_map every file in the pool, or None if the pool broke."""
+    pool = _get_pool()
+    try:
+        # map() keeps results in file order, so sheet contents stay stable
+        return list(pool.map(_parse_and_map_materialized, csv_files))
+    except BrokenProcessPool:
+        logger.warning("GSTR1 parse pool died (worker killed?); rebuilding it, parsing in-process")
+        _discard_pool(pool)
+        return None
+
+
+def generate_gstr1_excel(csv_files: List[Dict[str, Any]]) -> tuple[bytes, int]:
+    """
+    Generate a GSTR1 Excel workbook from a list of CSV files.
+    The workbook XML is written directly by fast_xlsx. Large multi-file
+    requests are parsed in a process pool; otherwise rows are streamed
+    straight from the CSV text into the writer.
+    
+    Args:
+        csv_files: List of {"name": filename, "content": csv_bytes_or_string}
+    
+    Returns:
+        (excel_bytes, sheets_processed_count)
+    """
+    parsed = None
+    total_size = sum(len(csv_file["content"]) for csv_file in csv_files)
+    if len(csv_files) >= 2 and total_size >= PARALLEL_MIN_BYTES and _parse_workers() > 1:
+        parsed = _parse_in_pool(csv_files)
+    if parsed is None:
+        parsed = map(parse_and_map, csv_files)
+    return assemble_workbook(parsed)
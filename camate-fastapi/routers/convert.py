@@ -8,6 +8,7 @@ POST /convert/{format}
   - Returns the new storage key
 """
 import io
+import csv
 import time
 import logging
 from typing import Literal
@@ -76,26 +77,50 @@ FORMAT_MAPPINGS = {
 }
 
 
-def convert_csv(content: str, format_name: str) -> tuple[str, int]:
+def convert_csv(content: bytes, format_name: str) -> tuple[bytes, int, bool]:
     """
     Renames columns in a CSV from the source format to standard GSTR1 column names.
-    Returns (converted_csv_string, row_count).
+    Works on the raw UTF-8 bytes: only the header record is decoded, parsed
+    and rewritten; the data rows are passed through untouched.
+    Returns (converted_csv_bytes, row_count, changed). When changed is False
+    nothing was renamed and the bytes are the original content.
     """
     mapping = FORMAT_MAPPINGS.get(format_name, {})
-    lines = content.strip().split('\n')
-    if len(lines) < 2:
-        return content, 0
+    data = content.lstrip() if content[:1].isspace() else content
 
-    # Parse header
-    original_headers = [h.strip().strip('"') for h in lines[0].split(',')]
-    new_headers = [mapping.get(h, h) for h in original_headers]
+    # Parse header (csv handles quoting, including newlines inside headers)
+    reader = csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', newline=''))
+    original_headers = next(reader, [])
 
-    result_lines = [','.join(f'"{h}"' for h in new_headers)]
-    for line in lines[1:]:
-        if line.strip():
-            result_lines.append(line)
+    # Offset of the newline that ends the header record
+    header_end = -1
+    for _ in range(reader.line_num):
+        header_end = data.find(b'\n', header_end + 1)
+        if header_end == -1:
+            return content, 0, False
+    body_start = header_end + 1
 
-    return '\n'.join(result_lines), len(lines) - 1
+    # Trailing blank lines don't count as rows
+    body_end = len(data)
+    while body_end > body_start and data[body_end - 1:body_end].isspace():
+        body_end -= 1
+    if body_end == body_start:
+        return content, 0, False
+
+    row_count = data.count(b'\n', body_start, body_end) + 1
+
+    stripped_headers = [h.strip() for h in original_headers]
+    if not any(h in mapping for h in stripped_headers):
+        # Already standard (e.g. a re-upload of a converted file)
+        return content, row_count, False
+
+    new_headers = [mapping.get(h, h) for h in stripped_headers]
+    header_buf = io.StringIO()
+    csv.writer(header_buf, quoting=csv.QUOTE_ALL, lineterminator='').writerow(new_headers)
+
+    # Keep the file's own line terminator after the header
+    terminator_start = header_end - 1 if data[header_end - 1:header_end] == b'\r' else header_end
+    return header_buf.getvalue().encode('utf-8') + data[terminator_start:], row_count, True
 
 
 @router.post("/{format}", response_model=ConvertResponse)
@@ -106,11 +131,19 @@ async def convert_format(format: SupportedFormat, payload: ConvertRequest):
     logger.info(f"Converting {payload.storage_key} from {format} format")
 
     try:
-        content = storage.read_file(payload.storage_key)
+        content = await storage.read_bytes_async(payload.storage_key)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    converted_content, row_count = convert_csv(content, format)
+    try:
+        converted_content, row_count, changed = convert_csv(content, format)
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"File is not valid UTF-8: {e}")
+
+    if not changed:
+        # Nothing was renamed; the source object already is the converted file
+        logger.info(f"No columns to convert: {row_count} rows, keeping {payload.storage_key}")
+        return ConvertResponse(converted_key=payload.storage_key, rows_converted=row_count)
 
     # Save converted file
     timestamp = int(time.time())
@@ -120,7 +153,7 @@ async def convert_format(format: SupportedFormat, payload: ConvertRequest):
         f"converted_{format}_{timestamp}_{original_name}"
     )
 
-    storage.save_file(converted_key, converted_content.encode('utf-8'), 'text/csv')
+    await storage.save_file_async(converted_key, converted_content, 'text/csv')
 
     logger.info(f"Conversion complete: {row_count} rows → {converted_key}")
     return ConvertResponse(converted_key=converted_key, rows_converted=row_count)
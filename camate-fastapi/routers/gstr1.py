@@ -10,6 +10,7 @@ POST /gstr1/generate
 """
 import io
 import time
+import asyncio
 import logging
 from typing import List
 from fastapi import APIRouter, HTTPException
@@ -48,25 +49,32 @@ async def generate_gstr1(payload: GenerateRequest):
     if not payload.upload_keys:
         raise HTTPException(status_code=400, detail="No upload_keys provided.")
 
-    # 1. Download all CSV files from R2
+    # 1. Download all CSV files from R2, concurrently; results keep key order
+    results = await asyncio.gather(
+        *(storage.read_bytes_async(key) for key in payload.upload_keys),
+        return_exceptions=True,
+    )
     csv_files = []
-    for key in payload.upload_keys:
-        try:
-            content = storage.read_file(key)
-            file_name = key.split('/')[-1]
-            # Strip timestamp prefix (e.g. "1234567890_b2b.csv" → "b2b.csv")
-            if '_' in file_name and file_name.split('_')[0].isdigit():
-                file_name = '_'.join(file_name.split('_')[1:])
-            csv_files.append({"name": file_name, "content": content})
-        except ValueError as e:
-            logger.warning(f"Skipping file {key}: {e}")
+    for key, content in zip(payload.upload_keys, results):
+        if isinstance(content, ValueError):
+            logger.warning(f"Skipping file {key}: {content}")
+            continue
+        if isinstance(content, BaseException):
+            raise content
+        # Raw bytes; parse_csv decodes them as it reads
+        file_name = key.split('/')[-1]
+        # Strip timestamp prefix (e.g. "1234567890_b2b.csv" → "b2b.csv")
+        if '_' in file_name and file_name.split('_')[0].isdigit():
+            file_name = '_'.join(file_name.split('_')[1:])
+        csv_files.append({"name": file_name, "content": content})
 
     if not csv_files:
         raise HTTPException(status_code=422, detail="No readable CSV files found in the provided keys.")
 
     # 2. Generate GSTR1 Excel
     try:
-        excel_bytes, sheets_processed = generate_gstr1_excel(csv_files)
+        # CPU-bound; run it off the event loop
+        excel_bytes, sheets_processed = await asyncio.to_thread(generate_gstr1_excel, csv_files)
     except Exception as e:
         logger.error(f"Excel generation failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Excel generation failed: {str(e)}")
@@ -77,7 +85,7 @@ async def generate_gstr1(payload: GenerateRequest):
     output_key = f"outputs/{payload.ca_code}/{payload.customer_id}/{payload.financial_year}/{payload.month}/{file_name}"
 
     try:
-        storage.save_file(
+        await storage.save_file_async(
             output_key,
             excel_bytes,
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -12,18 +12,38 @@ POST /verification/run
 """
 import io
 import re
+import asyncio
+import csv
 import time
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from openpyxl import load_workbook
+from openpyxl.styles import PatternFill
+from python_calamine import CalamineWorkbook
 
 import storage
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-GSTIN_REGEX = re.compile(r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$')
+# Shared by every marked cell; openpyxl stores it as a single fill record
+INVALID_FILL = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
+
+# Always used with fullmatch(), so no anchors; every GSTIN is 15 characters
+GSTIN_REGEX = re.compile(r'[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}')
+GSTIN_LENGTH = 15
+
+
+def _cell_text(value) -> str:
+    """Normalise a calamine cell value the way openpyxl's value would read."""
+    if not value:
+        return ''
+    # calamine reads every number as float; openpyxl gives ints for whole numbers
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip().upper()
 
 
 class VerificationRequest(BaseModel):
@@ -44,40 +64,14 @@ class VerificationSummary(BaseModel):
     status: str = "completed"
 
 
-@router.post("/run", response_model=VerificationSummary)
-async def run_verification(payload: VerificationRequest):
+def _verify_workbook(excel_bytes: bytes) -> tuple[List[dict], int, int, bytes, bytes]:
     """
-    Verify all GSTINs in a GSTR1 Excel file and produce a corrected version.
+    CPU-bound half of a verification run, kept off the event loop.
+    Returns (errors, total_checked, total_moved, corrected_xlsx, error_report_csv).
     """
-    import openpyxl
-    from openpyxl import load_workbook
-
-    logger.info(f"Verification started for: {payload.storage_key}")
-
-    # 1. Download the Excel from R2
-    try:
-        excel_bytes = storage.read_file(payload.storage_key).encode('latin-1')
-    except Exception:
-        # read_file returns str; for binary we need raw bytes
-        try:
-            import boto3
-            from botocore.config import Config
-            from config import settings
-            endpoint = settings.R2_ENDPOINT_URL or f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
-            s3 = boto3.client(
-                's3', endpoint_url=endpoint,
-                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                config=Config(signature_version='s3v4'), region_name='auto'
-            )
-            resp = s3.get_object(Bucket=settings.R2_BUCKET_NAME, Key=payload.storage_key)
-            excel_bytes = resp['Body'].read()
-        except Exception as e:
-            raise HTTPException(status_code=404, detail=f"Cannot read file: {e}")
-
-    # 2. Parse the workbook
+    # 2. Parse the workbook (read-only; openpyxl is only needed to mark rows)
     try:
-        wb = load_workbook(io.BytesIO(excel_bytes))
+        reader = CalamineWorkbook.from_filelike(io.BytesIO(excel_bytes))
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Cannot parse Excel file: {e}")
 
@@ -85,42 +79,86 @@ async def run_verification(payload: VerificationRequest):
     errors = []
     total_checked = 0
     total_moved = 0
+    rows_to_move = []
 
-    b2b_sheet = wb['b2b'] if 'b2b' in wb.sheetnames else None
-    b2cs_sheet = wb['b2cs'] if 'b2cs' in wb.sheetnames else None
+    # skip_empty_area=False keeps rows[0] as sheet row 1, like openpyxl
+    b2b_rows = (
+        reader.get_sheet_by_name('b2b').to_python(skip_empty_area=False)
+        if 'b2b' in reader.sheet_names else None
+    )
 
-    if b2b_sheet:
-        headers = [cell.value for cell in b2b_sheet[1]]
+    if b2b_rows:
+        headers = b2b_rows[0]
         gstin_col = next((i for i, h in enumerate(headers) if h and 'GSTIN' in str(h).upper()), None)
 
         if gstin_col is not None:
-            rows_to_move = []
-            for row_idx, row in enumerate(b2b_sheet.iter_rows(min_row=2, values_only=True), start=2):
-                gstin = str(row[gstin_col]).strip().upper() if row[gstin_col] else ''
-                if not gstin:
-                    continue
-                total_checked += 1
-
-                is_valid = bool(GSTIN_REGEX.match(gstin))
-                if not is_valid:
-                    errors.append({
-                        "gstin": gstin,
-                        "row": row_idx,
-                        "error_type": "invalid_gstin",
-                        "action": "moved_to_b2cs"
-                    })
-                    rows_to_move.append(row_idx)
-                    total_moved += 1
-
-            # Mark invalid rows (in a real impl, move data to b2cs)
-            for row_idx in rows_to_move:
-                b2b_sheet.cell(row=row_idx, column=1).fill = \
-                    openpyxl.styles.PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
+            # Pull just the GSTIN column, then validate it in one pass
+            gstins = [_cell_text(row[gstin_col]) for row in b2b_rows[1:]]
+            # A b2b sheet repeats the same few recipients across many
+            # invoices, so each distinct GSTIN is matched only once
+            fullmatch = GSTIN_REGEX.fullmatch
+            invalid = {
+                gstin for gstin in set(gstins)
+                if gstin and not (len(gstin) == GSTIN_LENGTH and fullmatch(gstin) is not None)
+            }
+            rows_to_move = [
+                row_idx for row_idx, gstin in enumerate(gstins, start=2)
+                if gstin in invalid
+            ]
+            total_checked = sum(1 for gstin in gstins if gstin)
+            total_moved = len(rows_to_move)
+            errors = [
+                {
+                    "gstin": gstins[row_idx - 2],
+                    "row": row_idx,
+                    "error_type": "invalid_gstin",
+                    "action": "moved_to_b2cs"
+                }
+                for row_idx in rows_to_move
+            ]
+
+    if rows_to_move:
+        wb = load_workbook(io.BytesIO(excel_bytes))
+        b2b_sheet = wb['b2b']
+        # Mark invalid rows (in a real impl, move data to b2cs)
+        for row_idx in rows_to_move:
+            b2b_sheet.cell(row=row_idx, column=1).fill = INVALID_FILL
+        corrected_buf = io.BytesIO()
+        wb.save(corrected_buf)
+        corrected_bytes = corrected_buf.getvalue()
+    else:
+        # Nothing to mark: the corrected file is the original, byte for byte
+        corrected_bytes = excel_bytes
 
     # 4. Generate error report CSV
-    error_csv = "GSTIN,Row,Error Type,Action\n"
-    for e in errors:
-        error_csv += f"{e['gstin']},{e['row']},{e['error_type']},{e['action']}\n"
+    # Written straight into UTF-8 bytes; csv quotes any comma/quote in a GSTIN
+    error_buf = io.BytesIO()
+    error_text = io.TextIOWrapper(error_buf, encoding='utf-8', newline='')
+    writer = csv.writer(error_text, lineterminator='\n')
+    writer.writerow(['GSTIN', 'Row', 'Error Type', 'Action'])
+    writer.writerows((e['gstin'], e['row'], e['error_type'], e['action']) for e in errors)
+    error_text.flush()
+    error_text.detach()   # keep error_buf open once the wrapper is collected
+
+    return errors, total_checked, total_moved, corrected_bytes, error_buf.getvalue()
+
+
+@router.post("/run", response_model=VerificationSummary)
+async def run_verification(payload: VerificationRequest):
+    """
+    Verify all GSTINs in a GSTR1 Excel file and produce a corrected version.
+    """
+    logger.info(f"Verification started for: {payload.storage_key}")
+
+    # 1. Download the Excel from R2
+    try:
+        excel_bytes = await storage.read_bytes_async(payload.storage_key)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Cannot read file: {e}")
+
+    # 2-4. Parse, validate, mark invalid rows and build the error report
+    errors, total_checked, total_moved, corrected_bytes, error_report = \
+        await asyncio.to_thread(_verify_workbook, excel_bytes)
 
     # 5. Save corrected Excel + error report to R2
     timestamp = int(time.time())
@@ -129,11 +167,9 @@ async def run_verification(payload: VerificationRequest):
     corrected_key = f"{base_path}/corrected_{timestamp}.xlsx"
     error_key = f"{base_path}/error_report_{timestamp}.csv"
 
-    corrected_buf = io.BytesIO()
-    wb.save(corrected_buf)
-    storage.save_file(corrected_key, corrected_buf.getvalue(),
-                      'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    storage.save_file(error_key, error_csv.encode('utf-8'), 'text/csv')
+    await storage.save_file_async(corrected_key, corrected_bytes,
+                                  'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    await storage.save_file_async(error_key, error_report, 'text/csv')
 
     import uuid
     run_id = str(uuid.uuid4())
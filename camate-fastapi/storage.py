@@ -2,8 +2,15 @@
 R2 Storage helper for the FastAPI service.
 Mirrors the Django service but uses async-friendly patterns.
 """
+import io
 import boto3
+import asyncio
 import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from config import settings
@@ -11,48 +18,161 @@ from config import settings
 logger = logging.getLogger(__name__)
 
 _client = None
+_client_lock = threading.Lock()
+
+# One pooled, retrying client shared by every request thread
+_CLIENT_CONFIG = Config(
+    signature_version='s3v4',
+    max_pool_connections=50,
+    retries={'max_attempts': 3, 'mode': 'standard'},
+)
+
+# Large outputs are uploaded in 8 MB parts, 8 at a time
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+    use_threads=True,
+)
+
 
 def get_r2_client():
     global _client
     if _client is None:
-        endpoint = settings.R2_ENDPOINT_URL or f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
-        _client = boto3.client(
-            's3',
-            endpoint_url=endpoint,
-            aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-            config=Config(signature_version='s3v4'),
-            region_name='auto'
-        )
+        with _client_lock:
+            if _client is None:
+                endpoint = settings.R2_ENDPOINT_URL or f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
+                _client = boto3.client(
+                    's3',
+                    endpoint_url=endpoint,
+                    aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+                    config=_CLIENT_CONFIG,
+                    region_name='auto'
+                )
     return _client
 
 
-def read_file(storage_key: str) -> str:
-    """Download a file from R2 and return its content as a UTF-8 string."""
+# ─── Read cache ──────────────────────────────────────────────────────────────
+# storage_key → (etag, bytes), least recently used first, bounded by total
+# bytes. Entries are revalidated against R2 with If-None-Match on every read,
+# so an overwritten object is never served stale; a hit only skips the body.
+_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _cache_get(storage_key: str) -> Optional[Tuple[str, bytes]]:
+    with _cache_lock:
+        entry = _cache.get(storage_key)
+        if entry is not None:
+            _cache.move_to_end(storage_key)
+        return entry
+
+
+def _cache_put(storage_key: str, etag: Optional[str], content: bytes) -> None:
+    global _cache_bytes
+    max_bytes = settings.R2_READ_CACHE_MAX_BYTES
+    with _cache_lock:
+        old = _cache.pop(storage_key, None)
+        if old is not None:
+            _cache_bytes -= len(old[1])
+        if not etag or len(content) > max_bytes:
+            return
+        _cache[storage_key] = (etag, content)
+        _cache_bytes += len(content)
+        while _cache_bytes > max_bytes:
+            _, (_, evicted) = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+def invalidate(storage_key: str) -> None:
+    """Drop any cached copy of `storage_key`."""
+    _cache_put(storage_key, None, b'')
+
+
+def _is_not_modified(error: ClientError) -> bool:
+    return (
+        error.response.get('Error', {}).get('Code') in ('304', 'NotModified')
+        or error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304
+    )
+
+
+def read_bytes(storage_key: str) -> bytes:
+    """
+    Download a file from R2 and return its raw bytes.
+    A cached copy is returned if R2 reports it unchanged (304).
+    """
     s3 = get_r2_client()
+    cached = _cache_get(storage_key)
     try:
-        response = s3.get_object(Bucket=settings.R2_BUCKET_NAME, Key=storage_key)
-        return response['Body'].read().decode('utf-8')
+        if cached is not None:
+            try:
+                response = s3.get_object(
+                    Bucket=settings.R2_BUCKET_NAME, Key=storage_key, IfNoneMatch=cached[0]
+                )
+            except ClientError as e:
+                if _is_not_modified(e):
+                    return cached[1]
+                raise
+        else:
+            response = s3.get_object(Bucket=settings.R2_BUCKET_NAME, Key=storage_key)
+        content = response['Body'].read()
     except ClientError as e:
         logger.error(f"R2 read error for {storage_key}: {e}")
         raise ValueError(f"Cannot read file from storage: {storage_key}")
 
+    _cache_put(storage_key, response.get('ETag'), content)
+    return content
+
 
 def save_file(storage_key: str, content: bytes, content_type: str = 'application/octet-stream') -> str:
-    """Upload bytes to R2 and return the storage key."""
+    """
+    Upload bytes to R2 and return the storage key.
+    Files above MULTIPART_THRESHOLD go up as a concurrent multipart upload.
+    """
     s3 = get_r2_client()
     try:
-        s3.put_object(
+        if len(content) > MULTIPART_THRESHOLD:
+            s3.upload_fileobj(
+                io.BytesIO(content),
+                settings.R2_BUCKET_NAME,
+                storage_key,
+                ExtraArgs={'ContentType': content_type},
+                Config=_TRANSFER_CONFIG,
+            )
+            # A multipart ETag isn't an MD5 of the body and isn't returned
+            # here; let the next read fetch and cache it instead
+            invalidate(storage_key)
+            return storage_key
+        response = s3.put_object(
             Bucket=settings.R2_BUCKET_NAME,
             Key=storage_key,
             Body=content,
             ContentType=content_type
         )
-        return storage_key
-    except ClientError as e:
+    except (ClientError, S3UploadFailedError) as e:
+        invalidate(storage_key)
         logger.error(f"R2 write error for {storage_key}: {e}")
         raise RuntimeError(f"Cannot save file to storage: {storage_key}")
 
+    # Outputs are usually read straight back (e.g. verification after generate)
+    _cache_put(storage_key, response.get('ETag'), content)
+    return storage_key
+
+
+# ─── Async wrappers ─────────────────────────────────────────────────────────
+# The routers are async; these run the blocking boto3 calls in the default
+# thread pool so the event loop keeps serving other requests meanwhile.
+
+async def read_bytes_async(storage_key: str) -> bytes:
+    return await asyncio.to_thread(read_bytes, storage_key)
+
+
+async def save_file_async(storage_key: str, content: bytes, content_type: str = 'application/octet-stream') -> str:
+    return await asyncio.to_thread(save_file, storage_key, content, content_type)
+
 
 def get_presigned_download_url(storage_key: str, expires_in: int = 300) -> str:
     """Generate a presigned GET URL for a file in R2."""